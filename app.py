@@ -12,8 +12,10 @@ from backend.routes.one_time_report_routes import one_time_report_bp  # Added
 from backend.models import RevokedToken
 from sqlalchemy import text
 import os
+import atexit
 import logging
-from logging.handlers import RotatingFileHandler
+import queue
+from logging.handlers import RotatingFileHandler, QueueHandler, QueueListener
 from datetime import datetime
 import sys
 
@@ -29,7 +31,9 @@ API_CONFIG = {
     "STATIC_FOLDER": os.path.abspath("backend/static/dist"),
     "REPORTS_DIR": os.getenv("RENDER_DISK_PATH", "static/reports"),
     "LOG_DIR": os.getenv("LOG_DIR", "logs"),
-    "ENV": os.getenv("FLASK_ENV", "production")
+    "ENV": os.getenv("FLASK_ENV", "production"),
+    # Production defaults to WARNING so per-request INFO/DEBUG records are dropped early
+    "LOG_LEVEL": os.getenv("LOG_LEVEL", "WARNING" if os.getenv("FLASK_ENV", "production") == "production" else "DEBUG")
 }
 
 def validate_env_vars():
@@ -45,7 +49,7 @@ def validate_env_vars():
         raise EnvironmentError(f"Missing required environment variables: {', '.join(missing_vars)}")
 
 def setup_logging(app):
-    """Configure advanced logging with file and console handlers."""
+    """Configure advanced logging with file and console handlers fed from a background queue."""
     os.makedirs(API_CONFIG["LOG_DIR"], exist_ok=True)
     log_file = os.path.join(API_CONFIG["LOG_DIR"], "healthtracker.log")
     file_handler = RotatingFileHandler(log_file, maxBytes=10*1024*1024, backupCount=5)
@@ -58,9 +62,14 @@ def setup_logging(app):
     file_handler.setFormatter(log_format)
     console_handler.setFormatter(log_format)
     
-    logging.getLogger().setLevel(logging.INFO if API_CONFIG["ENV"] == "production" else logging.DEBUG)
-    logging.getLogger().addHandler(file_handler)
-    logging.getLogger().addHandler(console_handler)
+    # Request threads only enqueue records; a listener thread does the file and console I/O
+    log_queue = queue.Queue(-1)
+    listener = QueueListener(log_queue, file_handler, console_handler, respect_handler_level=True)
+    listener.start()
+    atexit.register(listener.stop)
+
+    logging.getLogger().setLevel(API_CONFIG["LOG_LEVEL"].upper())
+    logging.getLogger().addHandler(QueueHandler(log_queue))
     
     return logging.getLogger(__name__)
 
@@ -5,15 +5,7 @@ from dotenv import load_dotenv
 # Load environment variables from .env file
 load_dotenv()
 
-# Setup basic logging
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.StreamHandler()  # Log to console
-    ]
-)
-
+# Handlers and levels are configured by the app entrypoint (see app.setup_logging)
 logger = logging.getLogger(__name__)
 logger.info("Config module loaded with logging enabled")
 
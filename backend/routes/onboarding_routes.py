@@ -10,27 +10,25 @@ from backend.utils.openai_utils import call_openai_api
 
 # Load environment variables from .env in backend folder
 os.environ.setdefault("OPENAI_API_KEY", os.getenv("OPENAI_API_KEY", ""))
-logging.basicConfig(
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    level=logging.INFO
-)
 
+# Handlers and levels are configured by the app entrypoint (see app.setup_logging)
 logger = logging.getLogger("onboarding_routes")
 onboarding_routes = Blueprint("onboarding_routes", __name__, url_prefix="/onboarding")
 
 # Configuration
 CONFIDENCE_THRESHOLD = 0.9  # Confidence threshold for stopping questioning
 MAX_QUESTIONS_PER_SESSION = 10  # Maximum questions to ask in one session
+EMERGENCY_KEYWORDS = (
+    "chest pain", "difficulty breathing", "severe bleeding", "unconscious",
+    "seizure", "sudden numbness", "severe allergic reaction", "anaphylaxis"
+)
+EMERGENCY_KEYWORDS_RE = re.compile("|".join(map(re.escape, EMERGENCY_KEYWORDS)), re.IGNORECASE)
 
 def check_for_emergency(user_input):
     """Check if user input contains emergency keywords."""
-    emergency_keywords = [
-        "chest pain", "difficulty breathing", "severe bleeding", "unconscious", 
-        "seizure", "sudden numbness", "severe allergic reaction", "anaphylaxis"
-    ]
-    for keyword in emergency_keywords:
-        if re.search(keyword, user_input.lower()):
-            return True, f"Emergency detected: {keyword}"
+    match = EMERGENCY_KEYWORDS_RE.search(user_input)
+    if match:
+        return True, f"Emergency detected: {match.group(0).lower()}"
     return False, None
 
 def generate_diagnostic_question(history):
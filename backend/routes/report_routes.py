@@ -11,6 +11,8 @@ import logging
 logger = logging.getLogger("report_routes")
 report_routes = Blueprint("report_routes", __name__, url_prefix="/api/reports")
 
+REPORT_TRIAGE_LEVELS = frozenset({"AT_HOME", "MODERATE", "SEVERE"})
+
 def determine_triage_level(symptoms, timeline):
     """Determine the triage level using OpenAI based on symptoms and timeline."""
     symptom_text = ", ".join(symptoms) if symptoms else "Not specified"
@@ -20,8 +22,9 @@ def determine_triage_level(symptoms, timeline):
         symptom_input=f"Symptoms: {symptom_text}\nTimeline: {timeline}"
     )
     try:
-        triage_level = call_openai_api(messages, max_tokens=10).strip()
-        if triage_level not in ["AT_HOME", "MODERATE", "SEVERE"]:
+        # Normalize once so the membership test and callers see the canonical form
+        triage_level = call_openai_api(messages, max_tokens=10).strip().upper()
+        if triage_level not in REPORT_TRIAGE_LEVELS:
             logger.warning(f"Invalid triage level received: {triage_level}, defaulting to MODERATE")
             return "MODERATE"
         return triage_level
@@ -29,6 +32,17 @@ def determine_triage_level(symptoms, timeline):
         logger.error(f"Failed to determine triage level: {str(e)}", exc_info=True)
         return "MODERATE"  # Default to MODERATE if assessment fails
 
+def extract_possible_conditions(content):
+    """Return the text after the first "Possible Conditions:" line, or "Unknown"."""
+    # Locate the first matching line in one scan instead of splitting the whole report
+    marker = content.find("Possible Conditions:")
+    if marker == -1:
+        return "Unknown"
+    line_start = content.rfind("\n", 0, marker) + 1
+    line_end = content.find("\n", marker)
+    line = content[line_start:line_end] if line_end != -1 else content[line_start:]
+    return line.split(":", 1)[1].strip()
+
 @report_routes.route("/", methods=["POST"])
 def generate_report():
     """Generate a medical report based on symptoms and timeline."""
@@ -61,11 +75,7 @@ def generate_report():
         
         content = call_openai_api(messages, max_tokens=500)
 
-        possible_conditions = "Unknown"
-        for line in content.split("\n"):
-            if "Possible Conditions:" in line:
-                possible_conditions = line.split(":", 1)[1].strip()
-                break
+        possible_conditions = extract_possible_conditions(content)
 
         report_data = {
             "id": None,
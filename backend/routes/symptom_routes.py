@@ -13,6 +13,7 @@ import logging
 from datetime import datetime
 import time
 import re
+from types import MappingProxyType
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 symptom_routes = Blueprint("symptom_routes", __name__, url_prefix="/api/symptoms")
@@ -22,6 +23,18 @@ RETRY_DELAY = 2
 MIN_CONFIDENCE_THRESHOLD = 95
 MAX_TOKENS = 1500
 TEMPERATURE = 0.7
+PREMIUM_TIERS = frozenset({UserTierEnum.PAID.value, UserTierEnum.ONE_TIME.value})
+# Returned in place of an assessment that fails the final confidence check
+LOW_CONFIDENCE_RESPONSE = MappingProxyType({
+    "is_assessment": False,
+    "is_question": True,
+    "possible_conditions": "I need more details—can you describe any other symptoms?",
+    "confidence": None,
+    "triage_level": None,
+    "care_recommendation": None,
+    "requires_upgrade": False,
+    "other_conditions": []
+})
 
 openai.api_key = os.getenv("OPENAI_API_KEY")
 if not openai.api_key:
@@ -34,10 +47,16 @@ class MockUser:
 
 def is_premium_user(user):
     """Check if the user has a premium subscription tier."""
-    return getattr(user, "subscription_tier", UserTierEnum.FREE.value) in {
-        UserTierEnum.PAID.value,
-        UserTierEnum.ONE_TIME.value
-    }
+    return getattr(user, "subscription_tier", UserTierEnum.FREE.value) in PREMIUM_TIERS
+
+def split_condition_name(name):
+    """Split a "Common (Medical)" condition name into its common and medical parts."""
+    if "(" not in name:
+        return name, "N/A"
+    common, _, rest = name.partition("(")
+    # Stop at the next "(" or ")" so nested parentheses give the same result as before
+    medical = rest.partition("(")[0].partition(")")[0].strip() if ")" in name else "N/A"
+    return common.strip(), medical
 
 @symptom_routes.route("/count", methods=["GET"])
 @token_required
@@ -100,26 +119,23 @@ def analyze_symptoms():
         # Final safety check: Ensure assessments meet confidence threshold
         if result.get("is_assessment", False) and result.get("confidence", 0) < MIN_CONFIDENCE_THRESHOLD:
             logger.warning(f"Assessment confidence {result.get('confidence')} below threshold {MIN_CONFIDENCE_THRESHOLD}, converting to question")
-            result = {
-                "is_assessment": False,
-                "is_question": True,
-                "possible_conditions": "I need more details—can you describe any other symptoms?",
-                "confidence": None,
-                "triage_level": None,
-                "care_recommendation": None,
-                "requires_upgrade": False,
-                "other_conditions": []
-            }
+            result = dict(LOW_CONFIDENCE_RESPONSE)
+            result["other_conditions"] = []
+
+        # Bind the fields read more than once below
+        is_assessment = result.get("is_assessment", False)
+        assessment = result.get("assessment", {})
 
         # Save assessment for authenticated users
         assessment_id = None
-        if result.get("is_assessment", False) and isinstance(user_id, int):
-            assessment_conditions = result.get("assessment", {}).get("conditions", [])
+        if is_assessment and isinstance(user_id, int):
+            assessment_conditions = assessment.get("conditions", [])
             primary_condition = assessment_conditions[0] if assessment_conditions else {"name": "Unknown", "confidence": 0}
+            condition_common, condition_medical = split_condition_name(primary_condition.get("name", "Unknown"))
             notes = {
                 "response": result,
-                "condition_common": primary_condition.get("name", "").split("(")[0].strip() if "(" in primary_condition.get("name", "") else primary_condition.get("name", "Unknown"),
-                "condition_medical": primary_condition.get("name", "").split("(")[1].split(")")[0].strip() if "(" in primary_condition.get("name", "") and ")" in primary_condition.get("name", "") else "N/A",
+                "condition_common": condition_common,
+                "condition_medical": condition_medical,
                 "confidence": result.get("confidence", 0),
                 "triage_level": result.get("triage_level", "MODERATE"),
                 "care_recommendation": result.get("care_recommendation", "Consult a healthcare provider"),
@@ -137,7 +153,7 @@ def analyze_symptoms():
 
         # Construct response for frontend, respecting clean_ai_response output
         response_data = {
-            "is_assessment": result.get("is_assessment", False),
+            "is_assessment": is_assessment,
             "next_question": result.get("possible_conditions") if result.get("is_question", False) else None,
             "possible_conditions": result.get("possible_conditions", ""),
             "confidence": result.get("confidence", None),
@@ -145,7 +161,7 @@ def analyze_symptoms():
             "care_recommendation": result.get("care_recommendation", None),
             "requires_upgrade": not is_premium_user(current_user),  # Always prompt upsell for non-premium users
             "assessment_id": assessment_id,
-            "assessment": result.get("assessment", {}),
+            "assessment": assessment,
             "other_conditions": result.get("other_conditions", [])
         }
 
@@ -282,12 +298,13 @@ def generate_doctor_report():
         confidence = result.get("confidence", 0)
         if isinstance(confidence, str):
             confidence = float(confidence.rstrip('%')) if '%' in confidence else float(confidence)
+        condition_common, condition_medical = split_condition_name(result.get("possible_conditions", "Unknown"))
         report_data = {
             "user_id": user_id if user_id is not None else generate_temp_user_id(request),
             "timestamp": datetime.utcnow().isoformat(),
             "symptom": symptom,
-            "condition_common": result.get("possible_conditions", "Unknown").split("(")[0].strip() if "(" in result.get("possible_conditions", "") else result.get("possible_conditions", "Unknown"),
-            "condition_medical": result.get("possible_conditions", "").split("(")[1].split(")")[0].strip() if "(" in result.get("possible_conditions", "") and ")" in result.get("possible_conditions", "") else "N/A",
+            "condition_common": condition_common,
+            "condition_medical": condition_medical,
             "confidence": confidence,
             "triage_level": result.get("triage_level", "MODERATE"),
             "care_recommendation": result.get("care_recommendation", "Consult a healthcare provider")
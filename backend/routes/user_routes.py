@@ -21,10 +21,11 @@ logger = logging.getLogger("user_routes")
 # Create Flask Blueprint
 user_routes = Blueprint("user_routes", __name__)
 
+EMAIL_RE = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
+
 def is_valid_email(email):
     """Check if the provided string is a valid email."""
-    email_regex = r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$'
-    return re.match(email_regex, email) is not None
+    return EMAIL_RE.match(email) is not None
 
 @user_routes.route("/login", methods=["POST"])
 @cross_origin()  # Allow CORS for this route
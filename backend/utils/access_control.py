@@ -1,11 +1,10 @@
 from backend.models import UserTierEnum
 
+DETAIL_ACCESS_TIERS = frozenset({UserTierEnum.PAID.value, UserTierEnum.ONE_TIME.value})
+
 def can_access_assessment_details(user):
     """
     Check if a user has access to detailed assessments and report storage.
     Returns True for PAID or ONE_TIME subscription tiers.
     """
-    return hasattr(user, "subscription_tier") and user.subscription_tier in [
-        UserTierEnum.PAID.value,
-        UserTierEnum.ONE_TIME.value
-    ]
\ No newline at end of file
+    return getattr(user, "subscription_tier", None) in DETAIL_ACCESS_TIERS
\ No newline at end of file
@@ -1,9 +1,12 @@
 import openai
+import orjson
 import os
+import functools
 import json
 import logging
 import random
 import re
+from types import MappingProxyType
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type
 
 # Constants
@@ -13,6 +16,38 @@ MIN_CONFIDENCE_THRESHOLD = 95
 MAX_TOKENS = 1500
 TEMPERATURE = 0.7
 MIN_USER_RESPONSES_FOR_ASSESSMENT = 3
+UPGRADE_EXEMPT_TIERS = frozenset({"PAID", "ONE_TIME"})
+VALID_TRIAGE_LEVELS = frozenset({"LOW", "MODERATE", "HIGH", "EMERGENCY"})
+NULLABLE_FIELDS = frozenset({"confidence", "triage_level", "care_recommendation"})
+AND_OR_SPLIT_RE = re.compile(r"\s+(and|or)\s+", re.IGNORECASE)
+TRAILING_COMMA_RE = re.compile(r",(\s*[}\]])")
+JSON_STRUCTURAL_CHAR_RE = re.compile(r'[{}"\\]')
+
+# Fallback returned when a response cannot be used; copied by create_default_response
+DEFAULT_RESPONSE = MappingProxyType({
+    "is_assessment": False,
+    "is_question": True,
+    "possible_conditions": "I couldn’t process that—can you describe your symptoms again?",
+    "confidence": None,
+    "triage_level": None,
+    "care_recommendation": None,
+    "requires_upgrade": False,
+    "assessment": {"conditions": []},
+    "other_conditions": []
+})
+
+# Field defaults filled in by _parse_response_cached. The containers are shared, which
+# is safe because the parsed dict is serialised before it leaves the cached function.
+RESPONSE_FIELD_DEFAULTS = MappingProxyType({
+    "is_assessment": False,
+    "is_question": True,
+    "possible_conditions": "Can you tell me more about your symptoms?",
+    "confidence": None,
+    "triage_level": None,
+    "care_recommendation": None,
+    "assessment": {"conditions": []},
+    "other_conditions": []
+})
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -47,12 +82,16 @@ You are Michele, an AI medical assistant designed to help users understand their
 - For critical symptoms (e.g., chest pain, shortness of breath), ask specific follow-up questions.
 - Do not provide a definitive diagnosis; always recommend consulting a healthcare provider for serious conditions.
 """
+SYSTEM_MESSAGE = {"role": "system", "content": SYSTEM_PROMPT}
 
 # Initialize OpenAI API key
 openai.api_key = os.getenv("OPENAI_API_KEY")
 if not openai.api_key:
     raise ValueError("OPENAI_API_KEY environment variable not set")
 
+# Shared client so the HTTP connection pool is reused across requests
+client = openai.OpenAI(api_key=openai.api_key)
+
 @retry(
     stop=stop_after_attempt(MAX_RETRIES),
     wait=wait_exponential(multiplier=1, min=RETRY_DELAY, max=10),
@@ -72,22 +111,18 @@ def call_openai_api(messages, response_format=None, max_tokens=MAX_TOKENS):
     """
     logger.info("Calling OpenAI API")
     try:
-        client = openai.OpenAI(api_key=openai.api_key)
         response = client.chat.completions.create(
             model="gpt-4o",  # Updated from gpt-4o-mini to gpt-4o
-            messages=[
-                {"role": "system", "content": SYSTEM_PROMPT},
-                *messages
-            ],
+            messages=[SYSTEM_MESSAGE, *messages],
             max_tokens=max_tokens,
             temperature=TEMPERATURE,
             response_format=response_format
         )
         content = response.choices[0].message.content
-        logger.info(f"OpenAI API response: {content}")
+        logger.info("OpenAI API response: %s", content)
         return content
     except Exception as e:
-        logger.error(f"Error calling OpenAI API: {str(e)}", exc_info=True)
+        logger.error("Error calling OpenAI API: %s", e, exc_info=True)
         raise
 
 def build_openai_messages(conversation_history, symptom):
@@ -109,200 +144,289 @@ def build_openai_messages(conversation_history, symptom):
         messages.append({"role": "user", "content": symptom})
     return messages
 
-def clean_ai_response(raw_response, user, conversation_history, symptom):
-    """Clean and validate OpenAI API response without overriding question content."""
-    # Log input details for debugging
-    logger.debug(f"Processing symptom: {symptom}")
-    if conversation_history:
-        logger.debug(f"Conversation history: {json.dumps(conversation_history)}")
-    logger.info(f"Raw AI response: {raw_response[:100]}...")
+def _extract_json_block(text):
+    """
+    Locate the JSON object inside a response that has surrounding text.
 
-    # Handle empty or invalid response
-    if not isinstance(raw_response, str) or not raw_response.strip():
-        logger.warning("Empty or invalid AI response received")
-        return {
-            "is_assessment": False,
-            "is_question": True,
-            "possible_conditions": "I couldn’t process that—can you describe your symptoms again?",
-            "confidence": None,
-            "triage_level": None,
-            "care_recommendation": None,
-            "requires_upgrade": getattr(user, "subscription_tier", "FREE") not in ["PAID", "ONE_TIME"],
-            "assessment": {"conditions": []},
-            "other_conditions": [],
-            "disclaimer": "This is for informational purposes only, not a substitute for medical advice."
-        }
+    Tries a ```json fenced block first, then the first balanced {...} object,
+    using plain substring searches and a single brace-counting pass that
+    visits only structural characters.
+
+    Args:
+        text (str): The raw response text.
+
+    Returns:
+        str or None: The candidate JSON text, or None if no object is found.
+    """
+    fence_start = text.find("```json")
+    if fence_start != -1:
+        body_start = fence_start + len("```json")
+        fence_end = text.find("```", body_start)
+        return text[body_start:fence_end if fence_end != -1 else None].strip()
+
+    start = text.find("{")
+    if start == -1:
+        return None
+    depth = 0
+    in_string = False
+    escaped_at = -1
+    # Only braces, quotes and backslashes affect the scan, so jump between them
+    for match in JSON_STRUCTURAL_CHAR_RE.finditer(text, start):
+        i = match.start()
+        if i == escaped_at:
+            continue
+        char = text[i]
+        if in_string:
+            if char == "\\":
+                escaped_at = i + 1
+            elif char == '"':
+                in_string = False
+        elif char == '"':
+            in_string = True
+        elif char == "{":
+            depth += 1
+        elif char == "}":
+            depth -= 1
+            if not depth:
+                return text[start:i + 1]
+    return None
 
+def _lenient_parse(raw_response):
+    """
+    Parse JSON, falling back to the embedded object without trailing commas.
+
+    Models occasionally wrap the JSON in a code fence or prose, or emit
+    almost-JSON such as {"a": 1,}; recovering it here avoids discarding the
+    assessment and re-prompting the user.
+
+    Raises:
+        json.JSONDecodeError: If the response is not valid JSON even after cleanup.
+    """
     try:
-        # Parse JSON response
-        parsed_json = json.loads(raw_response)
-        if not isinstance(parsed_json, dict):
-            raise ValueError("Response is not a dictionary")
-
-        # Ensure all required fields are present with defaults
-        defaults = {
-            "is_assessment": False,
-            "is_question": True,
-            "possible_conditions": "Can you tell me more about your symptoms?",
-            "confidence": None,
-            "triage_level": None,
-            "care_recommendation": None,
-            "requires_upgrade": getattr(user, "subscription_tier", "FREE") not in ["PAID", "ONE_TIME"],
-            "assessment": {"conditions": []},
-            "other_conditions": []
-        }
-        for key, value in defaults.items():
-            parsed_json.setdefault(key, value)
-            if parsed_json[key] is None and key not in ["confidence", "triage_level", "care_recommendation"]:
-                logger.warning(f"Field '{key}' is None, setting to default")
-                parsed_json[key] = value
-
-        # Enforce mutual exclusivity of is_assessment and is_question
-        if parsed_json["is_assessment"] and parsed_json["is_question"]:
-            logger.warning("Both is_assessment and is_question are true, prioritizing question")
+        return orjson.loads(raw_response)
+    except orjson.JSONDecodeError:
+        candidate = _extract_json_block(raw_response)
+        if candidate is None:
+            raise
+        cleaned = TRAILING_COMMA_RE.sub(r"\1", candidate)
+        if cleaned == raw_response:
+            raise
+        logger.warning("Recovered JSON object from malformed AI response")
+        return orjson.loads(cleaned)
+
+def _first_question(text):
+    """
+    Return the first sentence of text that ends in '?', or None.
+
+    Equivalent to searching for the regex [^.?!]*[?], but done with three
+    linear substring searches so long unpunctuated text cannot make the regex
+    engine retry the scan from every start position.
+    """
+    end = text.find("?")
+    if end == -1:
+        return None
+    start = max(text.rfind(".", 0, end), text.rfind("!", 0, end)) + 1
+    return text[start:end + 1]
+
+@functools.lru_cache(maxsize=1024)
+def _parse_response_cached(raw_response):
+    """
+    Parse and validate a raw OpenAI response independently of the user.
+
+    Identical responses are served from an LRU cache. The result is returned as
+    immutable orjson bytes so each caller can load its own mutable copy;
+    "requires_upgrade" is left unset unless the model provided it.
+
+    Raises:
+        json.JSONDecodeError: If the response is not valid JSON.
+        ValueError: If the response is not a JSON object.
+    """
+    # Parse JSON response (orjson.JSONDecodeError subclasses json.JSONDecodeError)
+    parsed_json = _lenient_parse(raw_response)
+    if not isinstance(parsed_json, dict):
+        raise ValueError("Response is not a dictionary")
+
+    # Ensure all required fields are present with defaults
+    for key, value in RESPONSE_FIELD_DEFAULTS.items():
+        parsed_json.setdefault(key, value)
+        if parsed_json[key] is None and key not in NULLABLE_FIELDS:
+            logger.warning("Field '%s' is None, setting to default", key)
+            parsed_json[key] = value
+
+    # Enforce mutual exclusivity of is_assessment and is_question
+    if parsed_json["is_assessment"] and parsed_json["is_question"]:
+        logger.warning("Both is_assessment and is_question are true, prioritizing question")
+        parsed_json["is_assessment"] = False
+
+    # Validate confidence for assessments
+    if parsed_json["is_assessment"]:
+        confidence = parsed_json.get("confidence")
+        if confidence is None or confidence < MIN_CONFIDENCE_THRESHOLD:
+            logger.info("Confidence %s below %s%%, converting to question", confidence, MIN_CONFIDENCE_THRESHOLD)
             parsed_json["is_assessment"] = False
             parsed_json["is_question"] = True
+            # Preserve OpenAI’s question; fallback only if invalid
+            if not parsed_json["possible_conditions"] or "?" not in parsed_json["possible_conditions"]:
+                parsed_json["possible_conditions"] = "I need more information to be confident—can you provide more details?"
+            parsed_json["confidence"] = None
+            parsed_json["triage_level"] = None
+            parsed_json["care_recommendation"] = None
+            parsed_json["assessment"] = {"conditions": []}
 
-        # Validate confidence for assessments
-        if parsed_json["is_assessment"]:
-            confidence = parsed_json.get("confidence")
-            if confidence is None or confidence < MIN_CONFIDENCE_THRESHOLD:
-                logger.info(f"Confidence {confidence} below {MIN_CONFIDENCE_THRESHOLD}%, converting to question")
-                parsed_json["is_assessment"] = False
-                parsed_json["is_question"] = True
-                # Preserve OpenAI’s question; fallback only if invalid
-                if not parsed_json["possible_conditions"] or "?" not in parsed_json["possible_conditions"]:
-                    parsed_json["possible_conditions"] = "I need more information to be confident—can you provide more details?"
-                parsed_json["confidence"] = None
-                parsed_json["triage_level"] = None
-                parsed_json["care_recommendation"] = None
-                parsed_json["assessment"] = {"conditions": []}
-
-        # Ensure only one question at a time when is_question is true
-        if parsed_json["is_question"]:
-            question_text = parsed_json["possible_conditions"]
-            logger.debug(f"Checking for multiple questions in: {question_text}")
-            # First, check for multiple question marks
-            if question_text.count("?") > 1:
-                logger.warning(f"Multiple question marks detected in possible_conditions: {question_text}")
-                first_question_match = re.search(r"[^.?!]*\?", question_text)
-                if first_question_match:
-                    parsed_json["possible_conditions"] = first_question_match.group(0).strip()
-                    logger.info(f"Trimmed to first question: {parsed_json['possible_conditions']}")
-                else:
-                    parsed_json["possible_conditions"] = "Can you tell me more about your symptoms?"
-                    logger.info("No clear first question found, using default")
+    # Ensure only one question at a time when is_question is true
+    if parsed_json["is_question"]:
+        question_text = parsed_json["possible_conditions"]
+        logger.debug("Checking for multiple questions in: %s", question_text)
+        # Both branches below need the first question, so scan for it once
+        first_sentence = _first_question(question_text)
+        # First, check for multiple question marks
+        if question_text.count("?") > 1:
+            logger.warning("Multiple question marks detected in possible_conditions: %s", question_text)
+            if first_sentence:
+                parsed_json["possible_conditions"] = first_sentence.strip()
+                logger.info("Trimmed to first question: %s", parsed_json["possible_conditions"])
             else:
-                # Take everything up to the first '?'
-                first_question_match = re.search(r"[^.?!]*\?", question_text)
-                if first_question_match:
-                    first_question = first_question_match.group(0).strip()
-                    # Check if there's an 'and' or 'or' within this segment
-                    split_match = re.search(r'\s+(and|or)\s+', first_question, flags=re.IGNORECASE)
-                    if split_match:
-                        split_point = split_match.start()
-                        first_part = first_question[:split_point].strip()
-                        # Ensure the first part is a complete question
-                        if first_part and first_part[0].isupper() and first_part[-1] not in ".!?":
-                            # Add a question mark if it's a question-like structure
-                            parsed_json["possible_conditions"] = first_part + "?"
-                            logger.info(f"Trimmed to first part before 'and/or': {parsed_json['possible_conditions']}")
-                        else:
-                            parsed_json["possible_conditions"] = first_question
-                            logger.info(f"No clear split, using first question: {parsed_json['possible_conditions']}")
+                parsed_json["possible_conditions"] = "Can you tell me more about your symptoms?"
+                logger.info("No clear first question found, using default")
+        else:
+            # Take everything up to the first '?'
+            if first_sentence:
+                first_question = first_sentence.strip()
+                # Check if there's an 'and' or 'or' within this segment
+                split_match = AND_OR_SPLIT_RE.search(first_question)
+                if split_match:
+                    split_point = split_match.start()
+                    first_part = first_question[:split_point].strip()
+                    # Ensure the first part is a complete question
+                    if first_part and first_part[0].isupper() and first_part[-1] not in ".!?":
+                        # Add a question mark if it's a question-like structure
+                        parsed_json["possible_conditions"] = first_part + "?"
+                        logger.info("Trimmed to first part before 'and/or': %s", parsed_json["possible_conditions"])
                     else:
                         parsed_json["possible_conditions"] = first_question
-                        logger.info(f"No 'and/or' in first question, using: {parsed_json['possible_conditions']}")
+                        logger.info("No clear split, using first question: %s", parsed_json["possible_conditions"])
                 else:
-                    parsed_json["possible_conditions"] = "Can you tell me more about your symptoms?"
-                    logger.info("No question mark found, using default")
+                    parsed_json["possible_conditions"] = first_question
+                    logger.info("No 'and/or' in first question, using: %s", parsed_json["possible_conditions"])
+            else:
+                parsed_json["possible_conditions"] = "Can you tell me more about your symptoms?"
+                logger.info("No question mark found, using default")
+
+    # Ensure possible_conditions is never empty or null
+    if not parsed_json["possible_conditions"]:
+        logger.warning("possible_conditions empty – returning error fallback")
+        parsed_json["possible_conditions"] = "I'm not sure what to ask—can you rephrase or try again?"
+        parsed_json["is_question"] = True
 
-        # Ensure possible_conditions is never empty or null
-        if not parsed_json["possible_conditions"]:
-            logger.warning("possible_conditions empty – returning error fallback")
-            parsed_json["possible_conditions"] = "I'm not sure what to ask—can you rephrase or try again?"
+    # Validate assessment structure for downstream use (e.g., PDF generation)
+    if parsed_json["is_assessment"]:
+        assessment = parsed_json.get("assessment")
+        conditions = assessment.get("conditions") if isinstance(assessment, dict) else None
+        # Every structural problem gets the same correction, so only the reason varies
+        invalid_reason = None
+        if not isinstance(assessment, dict):
+            invalid_reason = "Assessment field missing or invalid"
+        elif not isinstance(conditions, list):
+            invalid_reason = "Assessment conditions missing or invalid"
+        elif not conditions:
+            invalid_reason = "Assessment conditions list is empty"
+        else:
+            # Ensure conditions are properly formatted for downstream parsing
+            for condition in conditions:
+                if "name" not in condition or not isinstance(condition["name"], str):
+                    logger.warning("Invalid condition name: %s, setting to default", condition)
+                    condition["name"] = "Unknown (N/A)"
+                if "confidence" not in condition or not isinstance(condition["confidence"], (int, float)):
+                    logger.warning("Invalid condition confidence: %s, setting to 0", condition)
+                    condition["confidence"] = 0
+
+        if invalid_reason:
+            logger.warning("%s, converting to question", invalid_reason)
+            parsed_json["is_assessment"] = False
             parsed_json["is_question"] = True
+            parsed_json["possible_conditions"] = parsed_json["possible_conditions"] or "I couldn’t identify a condition—can you provide more details?"
+            parsed_json["confidence"] = None
+            parsed_json["triage_level"] = None
+            parsed_json["care_recommendation"] = None
+            parsed_json["assessment"] = {"conditions": []}
 
-        # Validate assessment structure for downstream use (e.g., PDF generation)
-        if parsed_json["is_assessment"]:
-            if "assessment" not in parsed_json or not isinstance(parsed_json["assessment"], dict):
-                logger.warning("Assessment field missing or invalid, converting to question")
-                parsed_json["is_assessment"] = False
-                parsed_json["is_question"] = True
-                parsed_json["possible_conditions"] = parsed_json["possible_conditions"] or "I couldn’t identify a condition—can you provide more details?"
-                parsed_json["confidence"] = None
-                parsed_json["triage_level"] = None
-                parsed_json["care_recommendation"] = None
-                parsed_json["assessment"] = {"conditions": []}
-            elif "conditions" not in parsed_json["assessment"] or not isinstance(parsed_json["assessment"]["conditions"], list):
-                logger.warning("Assessment conditions missing or invalid, converting to question")
-                parsed_json["is_assessment"] = False
-                parsed_json["is_question"] = True
-                parsed_json["possible_conditions"] = parsed_json["possible_conditions"] or "I couldn’t identify a condition—can you provide more details?"
-                parsed_json["confidence"] = None
-                parsed_json["triage_level"] = None
-                parsed_json["care_recommendation"] = None
-                parsed_json["assessment"] = {"conditions": []}
-            elif not parsed_json["assessment"]["conditions"]:
-                logger.warning("Assessment conditions list is empty, converting to question")
-                parsed_json["is_assessment"] = False
-                parsed_json["is_question"] = True
-                parsed_json["possible_conditions"] = parsed_json["possible_conditions"] or "I couldn’t identify a condition—can you provide more details?"
-                parsed_json["confidence"] = None
-                parsed_json["triage_level"] = None
-                parsed_json["care_recommendation"] = None
-                parsed_json["assessment"] = {"conditions": []}
-            else:
-                # Ensure conditions are properly formatted for downstream parsing
-                for condition in parsed_json["assessment"]["conditions"]:
-                    if "name" not in condition or not isinstance(condition["name"], str):
-                        logger.warning(f"Invalid condition name: {condition}, setting to default")
-                        condition["name"] = "Unknown (N/A)"
-                    if "confidence" not in condition or not isinstance(condition["confidence"], (int, float)):
-                        logger.warning(f"Invalid condition confidence: {condition}, setting to 0")
-                        condition["confidence"] = 0
-
-        # Validate triage_level and care_recommendation for assessments
-        if parsed_json["is_assessment"]:
-            valid_triage_levels = ["LOW", "MODERATE", "HIGH", "EMERGENCY"]
-            if parsed_json.get("triage_level") not in valid_triage_levels:
-                logger.warning(f"Invalid triage_level '{parsed_json.get('triage_level')}', defaulting to MODERATE")
-                parsed_json["triage_level"] = "MODERATE"
-            if not parsed_json["care_recommendation"]:
-                logger.info("care_recommendation missing for assessment, setting default")
-                parsed_json["care_recommendation"] = "Consult a healthcare provider."
-
-        # Ensure other_conditions is a list
-        if "other_conditions" not in parsed_json or not isinstance(parsed_json["other_conditions"], list):
-            logger.warning(f"other_conditions invalid or missing: {parsed_json.get('other_conditions')}, setting to empty list")
-            parsed_json["other_conditions"] = []
-
-        logger.info(f"Processed response: {json.dumps(parsed_json, indent=2)}")
+    # Validate triage_level and care_recommendation for assessments
+    if parsed_json["is_assessment"]:
+        if parsed_json.get("triage_level") not in VALID_TRIAGE_LEVELS:
+            logger.warning("Invalid triage_level '%s', defaulting to MODERATE", parsed_json.get("triage_level"))
+            parsed_json["triage_level"] = "MODERATE"
+        if not parsed_json["care_recommendation"]:
+            logger.info("care_recommendation missing for assessment, setting default")
+            parsed_json["care_recommendation"] = "Consult a healthcare provider."
+
+    # Ensure other_conditions is a list (RESPONSE_FIELD_DEFAULTS guarantees the key exists)
+    if not isinstance(parsed_json["other_conditions"], list):
+        logger.warning("other_conditions invalid or missing: %s, setting to empty list", parsed_json.get("other_conditions"))
+        parsed_json["other_conditions"] = []
+    return orjson.dumps(parsed_json)
+
+def create_default_response(requires_upgrade, possible_conditions=None):
+    """
+    Build a fallback response from DEFAULT_RESPONSE.
+
+    Args:
+        requires_upgrade (bool): Whether the user should be prompted to upgrade.
+        possible_conditions (str, optional): Message overriding the default prompt.
+
+    Returns:
+        dict: A fresh response dict that the caller may mutate.
+    """
+    response = dict(DEFAULT_RESPONSE)
+    response["requires_upgrade"] = requires_upgrade
+    response["assessment"] = {"conditions": []}
+    response["other_conditions"] = []
+    if possible_conditions:
+        response["possible_conditions"] = possible_conditions
+    return response
+
+def clean_ai_response(raw_response, user, conversation_history, symptom):
+    """Clean and validate OpenAI API response without overriding question content."""
+    # Log input details for debugging
+    logger.debug("Processing symptom: %s", symptom)
+    # Serialising the history is only worth it when DEBUG records are emitted
+    if conversation_history and logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Conversation history: %s", json.dumps(conversation_history))
+    logger.debug("Raw AI response: %.100s...", raw_response)
+
+    # Resolve the user's tier once; every return path below reuses it
+    requires_upgrade = getattr(user, "subscription_tier", "FREE") not in UPGRADE_EXEMPT_TIERS
+
+    # Handle empty or invalid response
+    if not isinstance(raw_response, str) or not raw_response.strip():
+        logger.warning("Empty or invalid AI response received")
+        response = create_default_response(requires_upgrade)
+        response["disclaimer"] = "This is for informational purposes only, not a substitute for medical advice."
+        return response
+
+    # Plain-text replies hold no JSON object, so skip parsing and recovery entirely
+    if "{" not in raw_response:
+        logger.error("AI response contains no JSON object")
+        return create_default_response(requires_upgrade)
+
+    try:
+        # Loading the cached bytes gives this caller a fresh dict (much cheaper than deepcopy)
+        parsed_json = orjson.loads(_parse_response_cached(raw_response))
+
+        # The upgrade flag depends on the user, so it is applied outside the cache
+        if parsed_json.get("requires_upgrade") is None:
+            parsed_json["requires_upgrade"] = requires_upgrade
+
+        # Pretty-printing the whole response is costly, so only do it when it will be emitted
+        if logger.isEnabledFor(logging.INFO):
+            logger.info("Processed response: %s", orjson.dumps(parsed_json, option=orjson.OPT_INDENT_2).decode())
         return parsed_json
 
     except json.JSONDecodeError as e:
-        logger.error(f"Failed to parse response as JSON: {str(e)}")
-        return {
-            "is_assessment": False,
-            "is_question": True,
-            "possible_conditions": "I couldn’t process that—can you describe your symptoms again?",
-            "confidence": None,
-            "triage_level": None,
-            "care_recommendation": None,
-            "requires_upgrade": getattr(user, "subscription_tier", "FREE") not in ["PAID", "ONE_TIME"],
-            "assessment": {"conditions": []},
-            "other_conditions": []
-        }
+        logger.error("Failed to parse response as JSON: %s", e)
+        return create_default_response(requires_upgrade)
     except Exception as e:
-        logger.error(f"Unexpected error processing response: {str(e)}", exc_info=True)
-        return {
-            "is_assessment": False,
-            "is_question": True,
-            "possible_conditions": "I encountered an issue processing your information. Could you try describing your symptoms again?",
-            "confidence": None,
-            "triage_level": None,
-            "care_recommendation": None,
-            "requires_upgrade": getattr(user, "subscription_tier", "FREE") not in ["PAID", "ONE_TIME"],
-            "assessment": {"conditions": []},
-            "other_conditions": []
-        }
\ No newline at end of file
+        logger.error("Unexpected error processing response: %s", e, exc_info=True)
+        return create_default_response(
+            requires_upgrade,
+            "I encountered an issue processing your information. Could you try describing your symptoms again?"
+        )
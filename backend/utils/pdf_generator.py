@@ -13,6 +13,11 @@ from backend.utils.openai_utils import call_openai_api
 
 logger = logging.getLogger(__name__)
 
+# raw_decode parses the leading JSON value and ignores any prose after it
+JSON_DECODER = json.JSONDecoder()
+SECTION_HEADER_RE = re.compile(r"###\s+")
+DIFF_TABLE_START_RE = re.compile(r"\[\s*\{")
+
 def generate_pdf_report(report_data):
     """Generate a PDF report with OpenAI-enhanced content and return its accessible URL."""
     
@@ -70,7 +75,7 @@ def generate_pdf_report(report_data):
         logger.error(f"Failed to call OpenAI API: {str(e)}", exc_info=True)
         raise
     
-    sections = re.split(r"###\s+", response.strip())
+    sections = SECTION_HEADER_RE.split(response.strip())
     section_dict = {}
     for section in sections:
         if section.strip():
@@ -96,12 +101,27 @@ def generate_pdf_report(report_data):
     if json_start != -1:
         json_lines = clinical_lines[json_start:]
         diff_table_raw = "\n".join(json_lines).strip()
-        diff_table_raw = re.sub(r"```json|```", "", diff_table_raw).strip()
+        # Slice out the fenced block with plain substring searches
+        fence_start = diff_table_raw.find("```json")
+        if fence_start != -1:
+            body_start = fence_start + len("```json")
+            fence_end = diff_table_raw.find("```", body_start)
+            diff_table_raw = diff_table_raw[body_start:fence_end if fence_end != -1 else None]
+        else:
+            diff_table_raw = diff_table_raw.replace("```", "")
+        diff_table_raw = diff_table_raw.strip()
     logger.info(f"Raw differential diagnosis JSON: {diff_table_raw}")
     
     try:
-        diff_data = json.loads(diff_table_raw) if diff_table_raw else []
-    except json.JSONDecodeError as e:
+        # Anchor on the "[{" that opens the table so bracketed prose before it is skipped
+        table_match = DIFF_TABLE_START_RE.search(diff_table_raw)
+        if table_match:
+            diff_data = JSON_DECODER.raw_decode(diff_table_raw, table_match.start())[0]
+        else:
+            diff_data = json.loads(diff_table_raw) if diff_table_raw else []
+        if not isinstance(diff_data, list) or not all(isinstance(item, dict) for item in diff_data):
+            raise ValueError(f"Expected a list of objects, got {type(diff_data).__name__}")
+    except ValueError as e:  # json.JSONDecodeError is a ValueError
         logger.error(f"Failed to parse differential diagnosis JSON: {diff_table_raw}, error: {str(e)}")
         diff_data = [{"condition": condition_common, "confidence": str(confidence) + "%"}] if confidence != "N/A" else []
     diff_conditions = [item["condition"] for item in diff_data]
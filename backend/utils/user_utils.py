@@ -3,4 +3,4 @@ def is_temp_user(user):
     Check if a user is temporary based on their ID.
     Returns True if user is None or their ID starts with 'temp_'.
     """
-    return user is None or (hasattr(user, 'id') and str(user.id).startswith("temp_"))
\ No newline at end of file
+    return user is None or str(getattr(user, 'id', '')).startswith("temp_")
\ No newline at end of file